@@ -0,0 +1,69 @@
+"""
+Gunicorn configuration for running the Healthcare Diagnosis API in production
+
+Usage: gunicorn -c gunicorn.conf.py main:app
+
+The app is preloaded and the ML models are trained once in the master process
+before workers are forked, so every worker shares the model pages copy-on-write
+instead of holding its own copy. The lifespan skips loading when models are
+already present.
+"""
+
+import gc
+import os
+
+from dotenv import load_dotenv
+
+# Gunicorn bypasses run_api.py, so load .env before anything reads the environment
+load_dotenv()
+
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', 8000)}"
+workers = int(os.getenv("WORKERS", os.cpu_count() or 1))
+worker_class = "uvicorn_worker.UvicornWorker"
+preload_app = True
+loglevel = os.getenv("LOG_LEVEL", "info").lower()
+accesslog = "-"
+
+
+def on_starting(server):
+    """Load models in the master process so forked workers inherit them"""
+    # Inherited by the workers so /admin/reload-models can have us restart them
+    os.environ["WORKER_SUPERVISOR_PID"] = str(os.getpid())
+    _preload_models(server, validate=True)
+
+
+def on_reload(server):
+    """Reload models in the master so workers restarted by SIGHUP use them"""
+    _preload_models(server)
+
+
+def _preload_models(server, validate=False):
+    """Load the models in the master, then freeze them for the forked workers"""
+    from log_config import start_log_listener, stop_log_listener
+    from run_api import validate_environment
+    from services import model as ml_service
+
+    data_path = os.getenv("DATA_PATH", "data/")
+    master_data_path = os.getenv("MASTER_DATA_PATH", "master-data/")
+
+    # Each worker starts its own log listener in the lifespan, so write out the
+    # master's records here and stop before forking (threads don't survive it)
+    start_log_listener()
+    try:
+        if validate and not validate_environment():
+            server.log.error("Environment validation failed. Exiting...")
+            raise SystemExit(1)
+        # The worker that handled the reload request has already retrained and
+        # written the model cache, so this is normally a cache hit
+        ml_service.load_models_and_data(data_path, master_data_path)
+    except Exception as e:
+        server.log.error(f"Failed to preload models, workers will retry: {e}")
+    finally:
+        stop_log_listener()
+
+    # Move everything allocated so far out of the GC's reach so collections in
+    # the workers don't touch (and un-share) the inherited pages. Unfreeze
+    # first so models replaced by a reload can be collected.
+    gc.unfreeze()
+    gc.collect()
+    gc.freeze()
\ No newline at end of file
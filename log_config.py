@@ -0,0 +1,81 @@
+"""
+Queue-based logging shared by the API entrypoints
+
+Records are queued and written by a listener thread so request handlers never
+block on console or file I/O. Set LOG_FILE to an empty value to log to the
+console only.
+
+The state lives here rather than in main.py because main.py may be loaded
+twice in one process (as __main__ and again as main by uvicorn); both copies
+must share a single queue and listener.
+"""
+
+import logging
+import os
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+_listener: Optional[QueueListener] = None
+_listener_users = 0
+_listener_lock = threading.Lock()
+
+
+def setup_logging(level: int = logging.INFO) -> None:
+    """Route root logging through the shared queue
+
+    Only the first call configures anything, so the entrypoint that runs first
+    decides the level. Any handlers already on the root logger are replaced.
+    """
+    global _listener
+
+    with _listener_lock:
+        if _listener is not None:
+            return
+
+        formatter = logging.Formatter(
+            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+        )
+        handlers = [logging.StreamHandler()]
+        log_file = os.getenv("LOG_FILE", "healthcare_api.log")
+        if log_file:
+            handlers.append(logging.FileHandler(log_file))
+        for handler in handlers:
+            handler.setFormatter(formatter)
+
+        log_queue = queue.Queue(-1)
+        _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        logging.basicConfig(
+            level=level,
+            format="%(message)s",
+            handlers=[QueueHandler(log_queue)],
+            force=True,
+        )
+
+
+def start_log_listener() -> None:
+    """Start writing queued records, unless a caller already has"""
+    global _listener_users
+
+    setup_logging()
+    with _listener_lock:
+        if _listener_users == 0:
+            _listener.start()
+        _listener_users += 1
+
+
+def stop_log_listener() -> None:
+    """Flush queued records and stop the listener once its last user is done
+
+    The listener thread must be stopped before forking, as threads don't
+    survive it.
+    """
+    global _listener_users
+
+    with _listener_lock:
+        if _listener_users == 0:
+            return
+        _listener_users -= 1
+        if _listener_users == 0:
+            _listener.stop()
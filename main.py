@@ -1,14 +1,20 @@
+import asyncio
+import operator
 import httpx
+import orjson
 
-from fastapi import FastAPI, HTTPException, Depends, status, Query
+from fastapi import FastAPI, HTTPException, Depends, Request, status, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
 
 from fastapi.exceptions import RequestValidationError
 import logging
 from typing import Dict, Any, Annotated
 import uvicorn
 import os
+import signal
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 
 # Import our modules
@@ -19,56 +25,119 @@ from schema.responses.diagnosis import (
     GetDiagnosisResponse,
     SymptomSearchResponse,
     HealthCheckResponse,
-    ErrorResponse,
 )
 
 from services.diagnosis import (
     search_symptoms_service,
-    process_diagnosis_request,
+    process_diagnosis_batch,
+    get_cached_diagnosis,
+    clear_diagnosis_cache,
     validate_diagnosis_request,
     get_symptom_suggestions,
     get_diagnosis_statistics,
 )
 
-from fastapi_limiter import FastAPILimiter
-from fastapi_limiter.depends import RateLimiter
 import redis.asyncio as redis
 
 from middleware.idempotency import IdempotencyMiddleware
+from middleware.rate_limit import RateLimiter, init_rate_limiter
 
+from log_config import setup_logging, start_log_listener, stop_log_listener
 from services import model as ml_service
+from services.batching import BatchScheduler
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.FileHandler("healthcare_api.log"), logging.StreamHandler()],
-)
+# Configure logging (queued, see log_config)
+setup_logging()
 logger = logging.getLogger(__name__)
 
+# Diagnosis record payload: (payload key, source attribute) for the diagnosis
+# response and the original request, fetched with one attrgetter call each
+_DIAGNOSIS_RECORD_FIELDS = (
+    ("primary_diagnosis", "primary_diagnosis"),
+    ("confidence_level", "confidence_level"),
+    ("description", "description"),
+    ("precautions", "precautions"),
+    ("severity_assessment", "severity_assessment"),
+    ("secondary_diagnosis", "secondary_diagnosis"),
+)
+_DIAGNOSIS_REQUEST_FIELDS = (
+    ("diagnosed_user_id", "user_id"),
+    ("initial_symptom", "initial_symptom"),
+    ("days_experiencing", "days_experiencing"),
+    ("additional_symptoms", "additional_symptoms"),
+)
+_record_keys = tuple(key for key, _ in _DIAGNOSIS_RECORD_FIELDS)
+_record_values = operator.attrgetter(*(attr for _, attr in _DIAGNOSIS_RECORD_FIELDS))
+_request_keys = tuple(key for key, _ in _DIAGNOSIS_REQUEST_FIELDS)
+_request_values = operator.attrgetter(*(attr for _, attr in _DIAGNOSIS_REQUEST_FIELDS))
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager"""
     # Startup
+    start_log_listener()
     logger.info("Starting Healthcare Diagnosis API...")
+
+    # Shared HTTP client for outbound calls (connection pooling + keep-alive,
+    # HTTP/2 multiplexing when the server supports it)
+    app.state.http = httpx.AsyncClient(
+        http2=True,
+        timeout=10.0,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+    )
+
+    # Bounded worker pool for CPU-bound inference and symptom matching
+    app.state.cpu_pool = ThreadPoolExecutor(
+        max_workers=os.cpu_count(), thread_name_prefix="cpu-pool"
+    )
+
+    # Micro-batcher coalescing concurrent diagnosis requests into one predict call
+    app.state.diagnosis_batcher = BatchScheduler(
+        process_diagnosis_batch,
+        max_batch_size=int(os.getenv("BATCH_MAX_SIZE", 32)),
+        max_latency_ms=float(os.getenv("BATCH_MAX_LATENCY_MS", 15)),
+        executor=app.state.cpu_pool,
+    )
+    app.state.diagnosis_batcher.start()
+
+    # Shared Redis client for rate limiting and idempotency. Responses stay as
+    # bytes because IdempotencyMiddleware stores raw response bodies.
+    redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    redis_pool = redis.BlockingConnectionPool.from_url(
+        redis_url,
+        max_connections=int(os.getenv("REDIS_MAX_CONNECTIONS", 64)),
+        decode_responses=False,
+    )
+    app.state.redis = redis.Redis.from_pool(redis_pool)
+
     try:
         # Connect to Redis
-        redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
-        redis_connection = redis.from_url(
-            redis_url, encoding="utf-8", decode_responses=True
-        )
-        await FastAPILimiter.init(redis_connection)
+        await init_rate_limiter(app.state.redis)
 
         # Load models and data on startup
         data_path = os.getenv("DATA_PATH", "data/")
         master_data_path = os.getenv("MASTER_DATA_PATH", "master-data/")
 
-        success = ml_service.load_models_and_data(data_path, master_data_path)
-        if success:
-            logger.info("Models loaded successfully during startup")
+        # Models may already be loaded in a preloading master process (gunicorn)
+        if ml_service.is_models_loaded():
+            logger.info("Models already loaded, skipping startup load")
         else:
-            logger.error("Failed to load models during startup")
+            # Read data files concurrently so the loader hits the page cache
+            loop = asyncio.get_running_loop()
+            data_files = ml_service.get_data_files(data_path, master_data_path)
+            await asyncio.gather(
+                *[
+                    loop.run_in_executor(None, ml_service.prewarm_file, file_path)
+                    for file_path in data_files
+                ]
+            )
+
+            success = ml_service.load_models_and_data(data_path, master_data_path)
+            if success:
+                logger.info("Models loaded successfully during startup")
+            else:
+                logger.error("Failed to load models during startup")
     except Exception as e:
         logger.error(f"Error during startup: {e}")
         # Don't prevent startup, but log the error
@@ -77,6 +146,11 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down Healthcare Diagnosis API...")
+    await app.state.diagnosis_batcher.stop()
+    await app.state.http.aclose()
+    await app.state.redis.aclose()
+    app.state.cpu_pool.shutdown(wait=False, cancel_futures=True)
+    stop_log_listener()
 
 
 # Initialize FastAPI app with lifespan
@@ -86,6 +160,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan,
 )
 
@@ -114,12 +189,29 @@ def ensure_models_loaded():
         )
 
 
+# Dependency to get the shared HTTP client
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    """Dependency to get the application's shared HTTP client"""
+    return request.app.state.http
+
+
+# Dependency to get the CPU-bound worker pool
+def get_cpu_pool(request: Request) -> ThreadPoolExecutor:
+    """Dependency to get the application's CPU-bound worker pool"""
+    return request.app.state.cpu_pool
+
+
+# Dependency to get the diagnosis micro-batcher
+def get_diagnosis_batcher(request: Request) -> BatchScheduler:
+    """Dependency to get the application's diagnosis batch scheduler"""
+    return request.app.state.diagnosis_batcher
+
+
 # Health Check Endpoints
 @app.get(
     "/",
     response_model=HealthCheckResponse,
     tags=["Health Check"],
-    dependencies=[Depends(RateLimiter(times=10, seconds=60))],
 )
 async def root() -> HealthCheckResponse:
     """Root endpoint - basic health check"""
@@ -134,7 +226,6 @@ async def root() -> HealthCheckResponse:
     "/health",
     response_model=HealthCheckResponse,
     tags=["Health Check"],
-    dependencies=[Depends(RateLimiter(times=10, seconds=60))],
 )
 async def health_check() -> HealthCheckResponse:
     """Detailed health check endpoint"""
@@ -150,7 +241,6 @@ async def health_check() -> HealthCheckResponse:
 @app.get(
     "/status",
     tags=["Health Check"],
-    dependencies=[Depends(RateLimiter(times=10, seconds=60))],
 )
 async def get_system_status() -> Dict[str, Any]:
     """Get detailed system status and statistics"""
@@ -190,7 +280,9 @@ async def get_system_status() -> Dict[str, Any]:
     dependencies=[Depends(RateLimiter(times=10, seconds=60))],
 )
 async def search_symptoms(
-    symptom_input: SymptomInput, _: None = Depends(ensure_models_loaded)
+    symptom_input: SymptomInput,
+    _: None = Depends(ensure_models_loaded),
+    cpu_pool: ThreadPoolExecutor = Depends(get_cpu_pool),
 ) -> SymptomSearchResponse:
     """
     Search for symptoms matching user input
@@ -202,7 +294,10 @@ async def search_symptoms(
     try:
         logger.info(f"Symptom search request: {symptom_input.symptom}")
 
-        response = search_symptoms_service(symptom_input.symptom)
+        loop = asyncio.get_running_loop()
+        response = await loop.run_in_executor(
+            cpu_pool, search_symptoms_service, symptom_input.symptom
+        )
 
         logger.info(f"Symptom search completed: found {len(response.matches)} matches")
         return response
@@ -221,11 +316,17 @@ async def search_symptoms(
     dependencies=[Depends(RateLimiter(times=10, seconds=60))],
 )
 async def get_symptom_suggestions_endpoint(
-    partial_symptom: str, limit: int = 5, _: None = Depends(ensure_models_loaded)
+    partial_symptom: str,
+    limit: int = 5,
+    _: None = Depends(ensure_models_loaded),
+    cpu_pool: ThreadPoolExecutor = Depends(get_cpu_pool),
 ) -> Dict[str, Any]:
     """Get symptom suggestions based on partial input"""
     try:
-        suggestions = get_symptom_suggestions(partial_symptom, limit)
+        loop = asyncio.get_running_loop()
+        suggestions = await loop.run_in_executor(
+            cpu_pool, get_symptom_suggestions, partial_symptom, limit
+        )
         return {
             "partial_input": partial_symptom,
             "suggestions": suggestions,
@@ -247,7 +348,10 @@ async def get_symptom_suggestions_endpoint(
     dependencies=[Depends(RateLimiter(times=10, seconds=60))],
 )
 async def get_diagnosis(
-    request: DiagnosisRequest, _: None = Depends(ensure_models_loaded)
+    request: DiagnosisRequest,
+    _: None = Depends(ensure_models_loaded),
+    http_client: httpx.AsyncClient = Depends(get_http_client),
+    batcher: BatchScheduler = Depends(get_diagnosis_batcher),
 ) -> GetDiagnosisResponse:
     """
     Get medical diagnosis based on symptoms
@@ -270,24 +374,20 @@ async def get_diagnosis(
                 status_code=status.HTTP_400_BAD_REQUEST, detail=error_message
             )
 
-        # Process the diagnosis
-        response = process_diagnosis_request(request)
-        
+        # Process the diagnosis, batched with concurrent requests on a cache miss
+        response = get_cached_diagnosis(request)
+        if response is None:
+            response = await batcher.submit(request)
+
         # Create diagnosis on DB
-        payload = {
-            "primary_diagnosis": response.primary_diagnosis,
-            "confidence_level": response.confidence_level,
-            "description": response.description,
-            "precautions": response.precautions,
-            "severity_assessment": response.severity_assessment,
-            "secondary_diagnosis": response.secondary_diagnosis,
-            "diagnosed_user_id": request.user_id,
-            "initial_symptom": request.initial_symptom,
-            "days_experiencing": request.days_experiencing,
-            "additional_symptoms": request.additional_symptoms,
-        }
+        payload = dict(zip(_record_keys, _record_values(response)))
+        payload.update(zip(_request_keys, _request_values(request)))
 
-        api_response = httpx.post("https://ground-shakers.xyz/api/v1/diagnoses", json=payload)
+        api_response = await http_client.post(
+            "https://ground-shakers.xyz/api/v1/diagnoses",
+            content=orjson.dumps(payload),
+            headers={"content-type": "application/json"},
+        )
         serialized_response: dict = api_response.json()
 
         if api_response.status_code != 200:
@@ -302,6 +402,12 @@ async def get_diagnosis(
 
     except HTTPException:
         raise
+    except httpx.HTTPError as e:
+        logger.error(f"Error creating diagnosis record: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="Error creating diagnosis record",
+        )
     except ValueError as e:
         logger.error(f"Validation error in diagnosis: {e}")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -319,11 +425,13 @@ async def get_diagnosis(
     tags=["Symptom Management"],
     dependencies=[Depends(RateLimiter(times=10, seconds=60))],
 )
-async def list_all_symptoms(_: None = Depends(ensure_models_loaded)) -> Dict[str, Any]:
+async def list_all_symptoms(_: None = Depends(ensure_models_loaded)) -> Response:
     """Get list of all available symptoms"""
     try:
-        symptoms = ml_service.get_available_symptoms()
-        return {"symptoms": sorted(symptoms), "total_count": len(symptoms)}
+        return Response(
+            content=ml_service.get_sorted_symptoms_json(),
+            media_type="application/json",
+        )
     except Exception as e:
         logger.error(f"Error listing symptoms: {e}")
         raise HTTPException(
@@ -337,11 +445,13 @@ async def list_all_symptoms(_: None = Depends(ensure_models_loaded)) -> Dict[str
     tags=["Diseases"],
     dependencies=[Depends(RateLimiter(times=10, seconds=60))],
 )
-async def list_all_diseases(_: None = Depends(ensure_models_loaded)) -> Dict[str, Any]:
+async def list_all_diseases(_: None = Depends(ensure_models_loaded)) -> Response:
     """Get list of all diagnosable diseases"""
     try:
-        diseases = ml_service.get_available_diseases()
-        return {"diseases": sorted(diseases), "total_count": len(diseases)}
+        return Response(
+            content=ml_service.get_sorted_diseases_json(),
+            media_type="application/json",
+        )
     except Exception as e:
         logger.error(f"Error listing diseases: {e}")
         raise HTTPException(
@@ -370,6 +480,24 @@ async def get_statistics(_: None = Depends(ensure_models_loaded)) -> Dict[str, A
     # Administrative Endpoints
 
 
+def restart_all_workers() -> bool:
+    """
+    Ask the process manager to restart every worker on the reloaded models
+
+    Each worker holds its own models and diagnosis cache, so a reload handled by
+    one worker would otherwise leave the rest on the old models. gunicorn and
+    multi-worker uvicorn export WORKER_SUPERVISOR_PID and restart all workers on
+    SIGHUP (gunicorn re-preloads in its on_reload hook). Returns False when
+    running as a single process.
+    """
+    supervisor_pid = os.getenv("WORKER_SUPERVISOR_PID")
+    if not supervisor_pid:
+        return False
+
+    os.kill(int(supervisor_pid), signal.SIGHUP)
+    return True
+
+
 @app.post(
     "/admin/reload-models",
     tags=["Admin"],
@@ -380,13 +508,18 @@ async def reload_models_endpoint() -> Dict[str, Any]:
     try:
         logger.info("Manual model reload requested")
         success = ml_service.reload_models()
+        clear_diagnosis_cache()
 
         if success:
             logger.info("Models reloaded successfully")
+            workers_restarting = restart_all_workers()
+            if workers_restarting:
+                logger.info("Requested a restart of all workers")
             return {
                 "status": "success",
                 "message": "Models reloaded successfully",
                 "timestamp": ml_service.get_model_status().last_loaded,
+                "workers_restarting": workers_restarting,
             }
         else:
             logger.error("Failed to reload models")
@@ -401,18 +534,21 @@ async def reload_models_endpoint() -> Dict[str, Any]:
 
 
 # Error Handlers
+# Payloads follow the ErrorResponse shape but are built as plain dicts to keep
+# Pydantic validation off the error path.
 @app.exception_handler(HTTPException)
 async def custom_http_exception_handler(request, exc: HTTPException):
     """Custom HTTP exception handler with detailed error response"""
     logger.error(f"HTTP {exc.status_code}: {exc.detail} - Path: {request.url.path}")
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
-        content=ErrorResponse(
-            error=exc.detail,
-            details=f"HTTP {exc.status_code} error occurred",
-            status_code=exc.status_code,
-        ).model_dump(),
+        content={
+            "error": exc.detail,
+            "details": f"HTTP {exc.status_code} error occurred",
+            "status_code": exc.status_code,
+        },
+        headers=getattr(exc, "headers", None),
     )
 
 
@@ -421,11 +557,13 @@ async def validation_exception_handler(request, exc: RequestValidationError):
     """Handle request validation errors"""
     logger.error(f"Validation error: {exc} - Path: {request.url.path}")
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-        content=ErrorResponse(
-            error="Validation Error", details=str(exc), status_code=422
-        ).model_dump(),
+        content={
+            "error": "Validation Error",
+            "details": str(exc),
+            "status_code": 422,
+        },
     )
 
 
@@ -436,13 +574,13 @@ async def general_exception_handler(request, exc: Exception):
         f"Unhandled exception: {exc} - Path: {request.url.path}", exc_info=True
     )
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        content=ErrorResponse(
-            error="Internal Server Error",
-            details="An unexpected error occurred",
-            status_code=500,
-        ).model_dump(),
+        content={
+            "error": "Internal Server Error",
+            "details": "An unexpected error occurred",
+            "status_code": 500,
+        },
     )
 
 
@@ -453,13 +591,20 @@ if __name__ == "__main__":
     reload = os.getenv("RELOAD", "True").lower() == "true"
     log_level = os.getenv("LOG_LEVEL", "info").lower()
 
+    start_log_listener()
     logger.info(f"Starting server on {host}:{port}")
 
-    uvicorn.run(
-        "main:app",
-        host=host,
-        port=port,
-        reload=reload,
-        log_level=log_level,
-        access_log=True,
-    )
+    try:
+        uvicorn.run(
+            "main:app",
+            host=host,
+            port=port,
+            reload=reload,
+            log_level=log_level,
+            access_log=True,
+            # uvloop is not available on Windows
+            loop="asyncio" if sys.platform == "win32" else "uvloop",
+            http="httptools",
+        )
+    finally:
+        stop_log_listener()
@@ -22,12 +22,22 @@ class IdempotencyMiddleware(BaseHTTPMiddleware):
         # Use environment variable if redis_url not provided
         if redis_url is None:
             redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
-        self._redis = redis.from_url(
-            redis_url, encoding="utf-8", decode_responses=False
-        )
+        self._redis_url = redis_url
+        self._redis: Optional[redis.Redis] = None
         self.ttl = ttl_seconds
         self.lock_ttl = lock_ttl
 
+    def _get_redis(self, request: Request) -> redis.Redis:
+        # Prefer the app's shared client (set up in lifespan) over a private one
+        if self._redis is None:
+            shared = getattr(request.app.state, "redis", None)
+            if shared is None:
+                shared = redis.from_url(
+                    self._redis_url, encoding="utf-8", decode_responses=False
+                )
+            self._redis = shared
+        return self._redis
+
     async def _acquire_lock(self, key: str) -> bool:
         # Use SET NX with an expiry to act as a lock
         val = str(asyncio.get_event_loop().time()).encode()
@@ -49,6 +59,8 @@ class IdempotencyMiddleware(BaseHTTPMiddleware):
 
         cache_key = f"idemp:resp:{idemp_key}"
         lock_key = f"idemp:lock:{idemp_key}"
+        # Resolve the Redis client before the first lookup
+        self._get_redis(request)
 
         # Check for cached response
         cached = await self._redis.get(cache_key)
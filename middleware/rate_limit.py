@@ -0,0 +1,92 @@
+# rate_limit.py
+import hashlib
+from math import ceil
+from typing import Optional
+
+import redis.asyncio as redis
+from fastapi import HTTPException, status
+from redis.exceptions import NoScriptError
+from starlette.requests import Request
+
+# Token bucket: refills `capacity` tokens every `window` ms. Checks and takes a
+# token atomically, returning 0 when allowed or the ms until the next token.
+TOKEN_BUCKET_SCRIPT = """
+local key = KEYS[1]
+local capacity = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+
+local now = redis.call("TIME")
+now = tonumber(now[1]) * 1000 + math.floor(tonumber(now[2]) / 1000)
+
+local bucket = redis.call("HMGET", key, "tokens", "ts")
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+
+tokens = math.min(capacity, tokens + (now - ts) * capacity / window)
+
+local retry_after = 0
+if tokens < 1 then
+    retry_after = math.ceil((1 - tokens) * window / capacity)
+else
+    tokens = tokens - 1
+end
+
+redis.call("HSET", key, "tokens", tostring(tokens), "ts", now)
+redis.call("PEXPIRE", key, window)
+return retry_after
+"""
+
+KEY_PREFIX = "rl"
+
+_script_sha: Optional[str] = None
+
+
+async def init_rate_limiter(redis_client: redis.Redis) -> None:
+    """Pre-load the token bucket script so each check is a single EVALSHA"""
+    global _script_sha
+    _script_sha = await redis_client.script_load(TOKEN_BUCKET_SCRIPT)
+
+
+def client_key(request: Request) -> str:
+    # Short fixed-width hash of the client address keeps Redis keys compact
+    forwarded = request.headers.get("X-Forwarded-For")
+    host = forwarded.split(",")[0].strip() if forwarded else request.client.host
+    return hashlib.blake2b(host.encode(), digest_size=8).hexdigest()
+
+
+class RateLimiter:
+    """Per-client, per-route token bucket rate limit dependency"""
+
+    def __init__(self, times: int, seconds: int):
+        if times < 1 or seconds < 1:
+            raise ValueError("times and seconds must be positive")
+        self.times = times
+        self.milliseconds = seconds * 1000
+
+    async def __call__(self, request: Request):
+        redis_client: redis.Redis = request.app.state.redis
+
+        # Key on the route template, not the raw path, to bound key cardinality
+        route = request.scope.get("route")
+        route_path = getattr(route, "path", request.scope["path"])
+        key = f"{KEY_PREFIX}:{client_key(request)}:{request.method}:{route_path}"
+
+        try:
+            retry_after = await self._check(redis_client, key)
+        except NoScriptError:
+            await init_rate_limiter(redis_client)
+            retry_after = await self._check(redis_client, key)
+
+        if retry_after:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too Many Requests",
+                headers={"Retry-After": str(ceil(int(retry_after) / 1000))},
+            )
+
+    async def _check(self, redis_client: redis.Redis, key: str) -> int:
+        if _script_sha is None:
+            raise NoScriptError("Rate limit script not loaded")
+        return await redis_client.evalsha(
+            _script_sha, 1, key, self.times, self.milliseconds
+        )
@@ -4,13 +4,17 @@ Startup script for Healthcare Diagnosis API
 This script handles environment setup and starts the FastAPI server
 """
 
+import atexit
 import os
+import signal
 import sys
 import logging
 from pathlib import Path
 import uvicorn
 from dotenv import load_dotenv
 
+import log_config
+
 
 def setup_logging():
     """Configure logging for the application"""
@@ -21,11 +25,11 @@ def setup_logging():
     log_path = Path(log_file).parent
     log_path.mkdir(exist_ok=True)
 
-    logging.basicConfig(
-        level=getattr(logging, log_level),
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[logging.FileHandler(log_file), logging.StreamHandler(sys.stdout)],
-    )
+    # Queued like the app's own logging, so the server never blocks on log I/O
+    log_config.setup_logging(getattr(logging, log_level))
+    log_config.start_log_listener()
+    # Flush whatever is still queued when the script exits
+    atexit.register(log_config.stop_log_listener)
 
     logger = logging.getLogger(__name__)
     logger.info(f"Logging configured with level: {log_level}")
@@ -36,17 +40,13 @@ def validate_environment():
     """Validate required environment variables and paths"""
     logger = logging.getLogger(__name__)
 
-    # Check required data directories
-    data_path = Path(os.getenv("DATA_PATH", "data/"))
-    master_data_path = Path(os.getenv("MASTER_DATA_PATH", "master-data/"))
+    # Imported here so the service module sees the .env values loaded in main()
+    from services import model as ml_service
 
-    required_files = [
-        data_path / "training.csv",
-        data_path / "testing.csv",
-        master_data_path / "symptom_severity.csv",
-        master_data_path / "symptom_description.csv",
-        master_data_path / "symptom_precaution.csv",
-    ]
+    # Check required data files
+    required_files = ml_service.get_data_files(
+        os.getenv("DATA_PATH", "data/"), os.getenv("MASTER_DATA_PATH", "master-data/")
+    )
 
     missing_files = []
     for file_path in required_files:
@@ -103,12 +103,18 @@ def main():
     port = int(os.getenv("PORT", 8000))
     reload = os.getenv("RELOAD", "True").lower() == "true"
     log_level = os.getenv("LOG_LEVEL", "info").lower()
+    # uvloop is not available on Windows
+    loop = "asyncio" if sys.platform == "win32" else "uvloop"
+    # Multiple workers can't be combined with auto-reload
+    workers = None if reload else int(os.getenv("WORKERS", os.cpu_count() or 1))
 
     logger.info(f"Starting Healthcare Diagnosis API...")
     logger.info(f"Host: {host}")
     logger.info(f"Port: {port}")
     logger.info(f"Reload: {reload}")
+    logger.info(f"Workers: {workers or 1}")
     logger.info(f"Log Level: {log_level}")
+    logger.info(f"Event Loop: {loop}")
 
     # Additional startup information
     data_path = os.getenv("DATA_PATH", "data/")
@@ -116,6 +122,11 @@ def main():
     logger.info(f"Data Path: {data_path}")
     logger.info(f"Master Data Path: {master_data_path}")
 
+    # uvicorn restarts its worker processes on SIGHUP; tell the workers where
+    # to send it so /admin/reload-models reaches all of them
+    if workers and workers > 1 and hasattr(signal, "SIGHUP"):
+        os.environ["WORKER_SUPERVISOR_PID"] = str(os.getpid())
+
     try:
         # Start the server
         uvicorn.run(
@@ -123,9 +134,11 @@ def main():
             host=host,
             port=port,
             reload=reload,
+            workers=workers,
             log_level=log_level,
             access_log=True,
-            loop="asyncio",
+            loop=loop,
+            http="httptools",
         )
     except KeyboardInterrupt:
         logger.info("Server shutdown requested by user")
@@ -0,0 +1,139 @@
+"""
+Contains the adaptive micro-batcher used to coalesce concurrent model calls.
+"""
+
+import asyncio
+import logging
+from concurrent.futures import Executor
+from typing import Any, Callable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class BatchScheduler:
+    """Coalesce concurrent submissions into batches for a single model call
+
+    Whatever is already queued is grouped (up to ``max_batch_size``) and
+    handed to ``batch_fn`` on the given executor. A lone item on an idle
+    scheduler is dispatched immediately; only while a batch is in flight or
+    the queue keeps filling does the collector wait up to ``max_latency_ms``
+    for stragglers. ``batch_fn`` must return one result per item, in order;
+    a result that is an ``Exception`` is raised to that item's caller.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 32,
+        max_latency_ms: float = 15,
+        executor: Optional[Executor] = None,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency_ms / 1000
+        self.executor = executor
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._collector: Optional[asyncio.Task] = None
+        self._inflight: Set[asyncio.Task] = set()
+
+    def start(self) -> None:
+        """Start the background collector task"""
+        if self._collector is None:
+            self._queue = asyncio.Queue()
+            self._collector = asyncio.create_task(self._collect())
+
+    async def stop(self) -> None:
+        """Stop collecting and wait for in-flight batches to finish"""
+        if self._collector is None:
+            return
+
+        self._collector.cancel()
+        try:
+            await self._collector
+        except asyncio.CancelledError:
+            pass
+        self._collector = None
+
+        # Fail anything still queued so callers are not left waiting
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Batch scheduler stopped"))
+
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+
+    async def submit(self, item: Any) -> Any:
+        """Queue an item and wait for its result"""
+        if self._collector is None:
+            raise RuntimeError("Batch scheduler is not running")
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _collect(self) -> None:
+        """Drain the queue into batches bounded by size and latency"""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await self._queue.get()]
+            try:
+                while len(batch) < self.max_batch_size and not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+
+                # Waiting only pays off under load; an idle scheduler dispatches now
+                if len(batch) < self.max_batch_size and (
+                    self._inflight or len(batch) > 1
+                ):
+                    deadline = loop.time() + self.max_latency
+                    while len(batch) < self.max_batch_size:
+                        timeout = deadline - loop.time()
+                        if timeout <= 0:
+                            break
+                        try:
+                            batch.append(
+                                await asyncio.wait_for(self._queue.get(), timeout)
+                            )
+                        except asyncio.TimeoutError:
+                            break
+            except asyncio.CancelledError:
+                # Items already taken off the queue would otherwise never resolve
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(RuntimeError("Batch scheduler stopped"))
+                raise
+
+            task = asyncio.create_task(self._dispatch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        """Run one batch on the executor and resolve its futures"""
+        items = [item for item, _ in batch]
+        loop = asyncio.get_running_loop()
+
+        try:
+            results = await loop.run_in_executor(self.executor, self.batch_fn, items)
+            if len(results) != len(items):
+                raise RuntimeError(
+                    f"Expected {len(items)} batch results, got {len(results)}"
+                )
+        except Exception as e:
+            logger.error(f"Error processing batch of {len(items)}: {str(e)}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
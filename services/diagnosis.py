@@ -1,6 +1,8 @@
 import logging
-import re
-from typing import List, Tuple, Optional
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Hashable, List, Tuple, Optional, Union
 
 from schema.requests.diagnosis import DiagnosisRequest
 from schema.responses.diagnosis import DiagnosisResponse, SymptomSearchResponse
@@ -9,6 +11,12 @@ from . import model as ml_service
 
 logger = logging.getLogger(__name__)
 
+# Diagnosis results by semantic input, most recently used last. The model output
+# only depends on the symptoms and days, so repeated combinations skip inference.
+DIAGNOSIS_CACHE_SIZE = 10_000
+_diagnosis_cache: "OrderedDict[Hashable, DiagnosisResponse]" = OrderedDict()
+_diagnosis_cache_lock = threading.Lock()
+
 
 def search_symptoms_service(symptom_query: str) -> SymptomSearchResponse:
     """
@@ -53,77 +61,255 @@ def process_diagnosis_request(request: DiagnosisRequest) -> DiagnosisResponse:
         RuntimeError: If models are not loaded
         ValueError: If symptom not found in database
     """
+    key = _diagnosis_cache_key(request)
+    cached = _get_cached_diagnosis(key)
+    if cached is not None:
+        return cached
+
     try:
-        logger.info(
-            f"Processing diagnosis request for symptom: {request.initial_symptom}"
+        primary_diagnosis, valid_symptoms = _prepare_diagnosis(request)
+
+        # Get secondary diagnosis using all symptoms, if it can matter
+        secondary_diagnosis = None
+        if _secondary_can_matter(len(valid_symptoms)):
+            secondary_diagnosis = ml_service.get_secondary_diagnosis(
+                valid_symptoms, assume_normalized=True
+            )
+
+        response = _build_diagnosis_response(
+            request, primary_diagnosis, secondary_diagnosis, valid_symptoms
         )
 
-        # Normalize and validate initial symptom
-        normalized_symptom = normalize_symptom(request.initial_symptom)
+    except ValueError:
+        raise
+    except Exception as e:
+        logger.error(f"Error in diagnosis service: {str(e)}")
+        raise RuntimeError(f"Error processing diagnosis: {str(e)}")
 
-        # Find matching symptom in database
-        matching_symptom = find_matching_symptom(normalized_symptom)
-        if not matching_symptom:
-            raise ValueError(
-                f"Symptom '{request.initial_symptom}' not found in database"
-            )
+    _cache_diagnosis(key, response)
+    return response
+
+
+def process_diagnosis_batch(
+    requests: List[DiagnosisRequest],
+) -> List[Union[DiagnosisResponse, Exception]]:
+    """
+    Service function to process several diagnosis requests at once
 
-        # Get primary diagnosis using decision tree
-        primary_diagnosis = ml_service.get_primary_diagnosis(matching_symptom)
-        logger.info(f"Primary diagnosis: {primary_diagnosis}")
+    The per-request work runs individually while the secondary diagnosis is
+    computed with a single SVM prediction over the whole batch.
 
-        # Get secondary diagnosis using all symptoms
-        all_symptoms = [matching_symptom] + [
-            normalize_symptom(s) for s in request.additional_symptoms
+    Args:
+        requests: DiagnosisRequests to process
+
+    Returns:
+        One entry per request, in order: the DiagnosisResponse, or the
+        ValueError/RuntimeError that process_diagnosis_request would raise
+    """
+    results: List[Union[DiagnosisResponse, Exception, None]] = [None] * len(requests)
+    prepared = []
+
+    for index, request in enumerate(requests):
+        cached = get_cached_diagnosis(request)
+        if cached is not None:
+            results[index] = cached
+            continue
+        try:
+            prepared.append((index, request, *_prepare_diagnosis(request)))
+        except ValueError as e:
+            results[index] = e
+        except Exception as e:
+            logger.error(f"Error in diagnosis service: {str(e)}")
+            results[index] = RuntimeError(f"Error processing diagnosis: {str(e)}")
+
+    if prepared:
+        # Get secondary diagnoses for the whole batch in one call, skipping
+        # requests where it can't change the response
+        secondary_diagnoses: List[Optional[str]] = [None] * len(prepared)
+        needs_secondary = [
+            position
+            for position, (_, _, _, valid_symptoms) in enumerate(prepared)
+            if _secondary_can_matter(len(valid_symptoms))
         ]
-        # Filter out invalid symptoms
-        valid_symptoms = [s for s in all_symptoms if ml_service.validate_symptom(s)]
+        if needs_secondary:
+            predictions = ml_service.get_secondary_diagnoses(
+                [prepared[position][3] for position in needs_secondary],
+                assume_normalized=True,
+            )
+            for position, secondary in zip(needs_secondary, predictions):
+                secondary_diagnoses[position] = secondary
 
-        secondary_diagnosis = ml_service.get_secondary_diagnosis(valid_symptoms)
-        logger.info(f"Secondary diagnosis: {secondary_diagnosis}")
+        for (index, request, primary_diagnosis, valid_symptoms), secondary in zip(
+            prepared, secondary_diagnoses
+        ):
+            try:
+                results[index] = _build_diagnosis_response(
+                    request, primary_diagnosis, secondary, valid_symptoms
+                )
+                _cache_diagnosis(_diagnosis_cache_key(request), results[index])
+            except Exception as e:
+                logger.error(f"Error in diagnosis service: {str(e)}")
+                results[index] = RuntimeError(f"Error processing diagnosis: {str(e)}")
 
-        # Calculate confidence level
-        confidence_level = calculate_confidence_level(
-            primary_diagnosis, secondary_diagnosis, len(valid_symptoms)
-        )
+    return results
 
-        # Calculate severity assessment
-        severity_assessment = ml_service.calculate_severity(
-            valid_symptoms, request.days_experiencing
-        )
 
-        # Get description and precautions
-        description = ml_service.get_disease_description(primary_diagnosis)
-        precautions = ml_service.get_disease_precautions(primary_diagnosis)
+def _diagnosis_cache_key(request: DiagnosisRequest) -> Hashable:
+    """
+    Build the cache key for a request's diagnosis
 
-        # Determine if secondary diagnosis should be included
-        include_secondary = (
-            secondary_diagnosis != primary_diagnosis
-            and secondary_diagnosis != "Unknown"
-            and confidence_level == "Moderate"
-        )
+    Additional symptoms are sorted since their order does not affect the result,
+    but duplicates are kept as they count towards confidence and severity. The
+    model load time is included so results from a previous model are not reused.
+    """
+    return (
+        ml_service.get_model_status().last_loaded,
+        request.initial_symptom,
+        request.days_experiencing,
+        tuple(sorted(request.additional_symptoms)),
+    )
 
-        response = DiagnosisResponse(
-            primary_diagnosis=primary_diagnosis,
-            secondary_diagnosis=secondary_diagnosis if include_secondary else None,
-            confidence_level=confidence_level,
-            description=description,
-            precautions=precautions,
-            severity_assessment=severity_assessment,
-        )
 
-        logger.info(
-            f"Diagnosis completed for {request.initial_symptom}: {primary_diagnosis}"
-        )
+def get_cached_diagnosis(request: DiagnosisRequest) -> Optional[DiagnosisResponse]:
+    """Return the cached diagnosis for a request, or None if it isn't cached"""
+    return _get_cached_diagnosis(_diagnosis_cache_key(request))
+
+
+def _get_cached_diagnosis(key: Hashable) -> Optional[DiagnosisResponse]:
+    """Return the cached diagnosis for a key, marking it recently used"""
+    with _diagnosis_cache_lock:
+        response = _diagnosis_cache.get(key)
+        if response is not None:
+            _diagnosis_cache.move_to_end(key)
         return response
 
-    except ValueError:
-        raise
-    except Exception as e:
-        logger.error(f"Error in diagnosis service: {str(e)}")
-        raise RuntimeError(f"Error processing diagnosis: {str(e)}")
 
+def _cache_diagnosis(key: Hashable, response: DiagnosisResponse) -> None:
+    """Store a diagnosis, evicting the least recently used past the size limit"""
+    with _diagnosis_cache_lock:
+        _diagnosis_cache[key] = response
+        _diagnosis_cache.move_to_end(key)
+        if len(_diagnosis_cache) > DIAGNOSIS_CACHE_SIZE:
+            _diagnosis_cache.popitem(last=False)
+
+
+def clear_diagnosis_cache() -> None:
+    """Drop all cached diagnoses, e.g. after the models are reloaded"""
+    with _diagnosis_cache_lock:
+        _diagnosis_cache.clear()
 
+
+def _secondary_can_matter(symptom_count: int) -> bool:
+    """
+    Check whether the secondary diagnosis can affect the response
+
+    With fewer than two symptoms the confidence level is "Low" whatever the
+    secondary diagnosis is, and it is only included at "Moderate" confidence.
+    """
+    return symptom_count >= 2
+
+
+def _prepare_diagnosis(request: DiagnosisRequest) -> Tuple[str, List[str]]:
+    """
+    Resolve the initial symptom, primary diagnosis and valid symptom list
+
+    Args:
+        request: DiagnosisRequest containing symptom information
+
+    Returns:
+        Tuple of (primary_diagnosis, valid_symptoms)
+
+    Raises:
+        ValueError: If symptom not found in database
+    """
+    logger.info(f"Processing diagnosis request for symptom: {request.initial_symptom}")
+
+    # Normalize and validate initial symptom
+    normalized_symptom = normalize_symptom(request.initial_symptom)
+
+    # Find matching symptom in database
+    matching_symptom = find_matching_symptom(normalized_symptom)
+    if not matching_symptom:
+        raise ValueError(f"Symptom '{request.initial_symptom}' not found in database")
+
+    # Get primary diagnosis using decision tree
+    primary_diagnosis = ml_service.get_primary_diagnosis(matching_symptom)
+    logger.info(f"Primary diagnosis: {primary_diagnosis}")
+
+    # Normalize every symptom once and filter out invalid ones. The model
+    # calls downstream take the normalized names as-is.
+    normalized_match = matching_symptom.replace(" ", "_").lower()
+    valid_symptoms = (
+        [normalized_match]
+        if ml_service.validate_symptom(normalized_match, assume_normalized=True)
+        else []
+    )
+    known_symptoms = ml_service.get_normalized_symptom_index()
+    for symptom in request.additional_symptoms:
+        normalized = normalize_symptom(symptom)
+        if normalized in known_symptoms:
+            valid_symptoms.append(normalized)
+
+    return primary_diagnosis, valid_symptoms
+
+
+def _build_diagnosis_response(
+    request: DiagnosisRequest,
+    primary_diagnosis: str,
+    secondary_diagnosis: Optional[str],
+    valid_symptoms: List[str],
+) -> DiagnosisResponse:
+    """
+    Assemble the DiagnosisResponse from the model outputs
+
+    Args:
+        request: DiagnosisRequest containing symptom information
+        primary_diagnosis: Decision tree diagnosis
+        secondary_diagnosis: SVM diagnosis, or None if it was skipped
+        valid_symptoms: Normalized symptoms found in the database
+
+    Returns:
+        DiagnosisResponse with diagnosis results
+    """
+    logger.info(f"Secondary diagnosis: {secondary_diagnosis}")
+
+    # Calculate confidence level
+    confidence_level = calculate_confidence_level(
+        primary_diagnosis, secondary_diagnosis, len(valid_symptoms)
+    )
+
+    # Calculate severity assessment
+    severity_assessment = ml_service.calculate_severity(
+        valid_symptoms, request.days_experiencing, assume_normalized=True
+    )
+
+    # Get description and precautions
+    description = ml_service.get_disease_description(primary_diagnosis)
+    precautions = ml_service.get_disease_precautions(primary_diagnosis)
+
+    # Determine if secondary diagnosis should be included
+    include_secondary = (
+        secondary_diagnosis != primary_diagnosis
+        and secondary_diagnosis != "Unknown"
+        and confidence_level == "Moderate"
+    )
+
+    response = DiagnosisResponse(
+        primary_diagnosis=primary_diagnosis,
+        secondary_diagnosis=secondary_diagnosis if include_secondary else None,
+        confidence_level=confidence_level,
+        description=description,
+        precautions=precautions,
+        severity_assessment=severity_assessment,
+    )
+
+    logger.info(
+        f"Diagnosis completed for {request.initial_symptom}: {primary_diagnosis}"
+    )
+    return response
+
+
+@lru_cache(maxsize=4096)
 def normalize_symptom(symptom: str) -> str:
     """
     Normalize symptom string for consistent processing
@@ -147,20 +333,7 @@ def find_matching_symptom(normalized_symptom: str) -> Optional[str]:
     Returns:
         Matching symptom from database or None if not found
     """
-    available_symptoms = ml_service.get_available_symptoms()
-
-    # Try exact match first
-    for symptom in available_symptoms:
-        if symptom.lower() == normalized_symptom:
-            return symptom
-
-    # Try partial match
-    pattern = re.compile(normalized_symptom, re.IGNORECASE)
-    for symptom in available_symptoms:
-        if pattern.search(symptom.lower()):
-            return symptom
-
-    return None
+    return ml_service.match_symptom(normalized_symptom)
 
 
 def calculate_confidence_level(
@@ -240,12 +413,14 @@ def validate_diagnosis_request(request: DiagnosisRequest) -> Tuple[bool, str]:
     if request.days_experiencing < 1 or request.days_experiencing > 365:
         return False, "Days experiencing symptoms must be between 1 and 365"
 
-    # Validate additional symptoms (optional validation)
-    invalid_additional = []
-    for symptom in request.additional_symptoms:
-        normalized = normalize_symptom(symptom)
-        if not find_matching_symptom(normalized):
-            invalid_additional.append(symptom)
+    # Validate additional symptoms (optional validation). Processing only keeps
+    # exact matches, so check those rather than running a partial match.
+    known_symptoms = ml_service.get_normalized_symptom_index()
+    invalid_additional = [
+        symptom
+        for symptom in request.additional_symptoms
+        if normalize_symptom(symptom) not in known_symptoms
+    ]
 
     if invalid_additional:
         logger.warning(f"Invalid additional symptoms ignored: {invalid_additional}")
@@ -2,14 +2,21 @@
 Contains the code for the AI model that predicts diseases based on symptoms.
 """
 
+import hashlib
+import os
+
+import joblib
+import orjson
 import pandas as pd
 import numpy as np
-import re
 import csv
 import logging
+from bisect import bisect_right
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Tuple, Optional
+from typing import Iterator, List, Dict, Mapping, Sequence, Set, Tuple, Optional
+import sklearn
 from sklearn import preprocessing
 from sklearn.tree import DecisionTreeClassifier, _tree
 from sklearn.model_selection import train_test_split, cross_val_score
@@ -28,18 +35,95 @@ logger = logging.getLogger(__name__)
 ml_models: Dict = {}
 data_dictionaries: Dict = {"severity": {}, "descriptions": {}, "precautions": {}}
 symptoms_dict: Dict = {}
+# Lowercased symptom name -> feature column index (first column wins on clashes)
+normalized_symptoms_dict: Dict[str, int] = {}
+# Lowercased severity symptom name -> severity score (first entry wins on clashes)
+normalized_severity_dict: Dict[str, int] = {}
 feature_names: List[str] = []
+# Immutable copy of feature_names handed out by get_available_symptoms
+_feature_names_tuple: Tuple[str, ...] = ()
+# Lowercased feature names, index-aligned with feature_names
+normalized_feature_names: Tuple[str, ...] = ()
+# Normalized feature names joined by newlines, with each name's start offset
+# (plus an end sentinel), so substring search is one C-level scan per hit
+_symptom_index_text: str = ""
+_symptom_index_offsets: Tuple[int, ...] = (0,)
+# Normalized symptom name -> decision tree diagnosis, plus the diagnosis for a
+# symptom the tree never tests (every split takes the negative branch)
+_primary_by_symptom: Dict[str, str] = {}
+_primary_default: str = "Unknown"
 label_encoder = None
+# Decoded class names; indexing this is what label_encoder.inverse_transform does
+_classes_array: np.ndarray = np.array([], dtype=object)
+# Decoded class names as an immutable tuple for get_available_diseases
+_diseases_tuple: Tuple[str, ...] = ()
 model_status = ModelStatus(
     loaded=False, data_path="data/", master_data_path="master-data/"
 )
 
 
-def load_models_and_data(
+def _build_list_json(key: str, items: Tuple[str, ...]) -> bytes:
+    """Serialize a list endpoint payload once"""
+    return orjson.dumps({key: items, "total_count": len(items)})
+
+
+# Sorted listings and their serialized payloads, rebuilt on every (re)load
+_sorted_symptoms: Tuple[str, ...] = ()
+_sorted_diseases: Tuple[str, ...] = ()
+_sorted_symptoms_json: bytes = _build_list_json("symptoms", ())
+_sorted_diseases_json: bytes = _build_list_json("diseases", ())
+
+# Data file names, relative to data_path / master_data_path
+TRAINING_FILE = "training.csv"
+TESTING_FILE = "testing.csv"
+SEVERITY_FILE = "symptom_severity.csv"
+DESCRIPTION_FILE = "symptom_description.csv"
+PRECAUTION_FILE = "symptom_precaution.csv"
+
+# Trained models are cached here keyed by a hash of the training data; an empty
+# value disables the cache. Bump the version when the training code changes.
+MODEL_CACHE_PATH = os.getenv("MODEL_CACHE_PATH", "models/")
+MODEL_CACHE_VERSION = 1
+
+
+def get_data_files(
     data_path: str = "data/", master_data_path: str = "master-data/"
+) -> List[Path]:
+    """Get the paths of all files read by load_models_and_data"""
+    data_path = Path(data_path)
+    master_data_path = Path(master_data_path)
+    return [
+        data_path / TRAINING_FILE,
+        data_path / TESTING_FILE,
+        master_data_path / SEVERITY_FILE,
+        master_data_path / DESCRIPTION_FILE,
+        master_data_path / PRECAUTION_FILE,
+    ]
+
+
+def prewarm_file(file_path: Path) -> int:
+    """Read a file once so later reads are served from the OS page cache"""
+    total = 0
+    try:
+        with open(file_path, "rb") as file:
+            while chunk := file.read(1 << 20):
+                total += len(chunk)
+    except OSError as e:
+        logger.warning(f"Could not prewarm {file_path}: {e}")
+    return total
+
+
+def load_models_and_data(
+    data_path: str = "data/",
+    master_data_path: str = "master-data/",
+    force_retrain: bool = False,
 ) -> bool:
-    """Load ML models and supporting data"""
+    """Load ML models and supporting data, reusing cached models unless forced"""
     global ml_models, data_dictionaries, symptoms_dict, feature_names, label_encoder, model_status
+    global _feature_names_tuple, normalized_feature_names, normalized_symptoms_dict
+    global _symptom_index_text, _symptom_index_offsets
+    global _primary_by_symptom, _primary_default, _classes_array, _diseases_tuple
+    global _sorted_symptoms, _sorted_diseases, _sorted_symptoms_json, _sorted_diseases_json
 
     try:
         logger.info("Loading ML models and data...")
@@ -52,8 +136,8 @@ def load_models_and_data(
         model_status.master_data_path = str(master_data_path)
 
         # Load training and testing data
-        training_file = data_path / "training.csv"
-        testing_file = data_path / "testing.csv"
+        training_file = data_path / TRAINING_FILE
+        testing_file = data_path / TESTING_FILE
 
         if not training_file.exists() or not testing_file.exists():
             raise FileNotFoundError(f"Data files not found in {data_path}")
@@ -63,56 +147,115 @@ def load_models_and_data(
 
         # Prepare features and labels
         feature_names = training_data.columns[:-1].tolist()
+        _feature_names_tuple = tuple(feature_names)
+        normalized_feature_names = tuple(name.lower() for name in feature_names)
         X = training_data[feature_names]
         y = training_data["prognosis"]
 
         # Create symptoms dictionary
         symptoms_dict = {symptom: index for index, symptom in enumerate(feature_names)}
+        normalized_symptoms_dict = {}
+        for index, symptom in enumerate(normalized_feature_names):
+            normalized_symptoms_dict.setdefault(symptom, index)
 
-        # Encode labels
-        label_encoder = preprocessing.LabelEncoder()
-        label_encoder.fit(y)
-        y_encoded = label_encoder.transform(y)
-
-        # Split data
-        X_train, X_test, y_train, y_test = train_test_split(
-            X, y_encoded, test_size=0.33, random_state=42
+        # Build the substring search index over the normalized names
+        _symptom_index_text, _symptom_index_offsets = _build_symptom_index(
+            normalized_feature_names
         )
+        _search_normalized_symptoms.cache_clear()
+
+        cache_file = _model_cache_file(training_file)
+        cached_models = None if force_retrain else _load_model_cache(cache_file)
+
+        if cached_models is not None:
+            dt_classifier = cached_models["decision_tree"]
+            svm_classifier = cached_models["svm"]
+            label_encoder = cached_models["label_encoder"]
+            dt_accuracy, svm_accuracy, cv_mean = cached_models["metrics"]
+        else:
+            # Encode labels
+            label_encoder = preprocessing.LabelEncoder()
+            label_encoder.fit(y)
+            y_encoded = label_encoder.transform(y)
+
+            # Split data
+            X_train, X_test, y_train, y_test = train_test_split(
+                X, y_encoded, test_size=0.33, random_state=42
+            )
+
+            # Train Decision Tree
+            dt_classifier = DecisionTreeClassifier(random_state=42)
+            dt_classifier.fit(X_train, y_train)
 
-        # Train Decision Tree
-        dt_classifier = DecisionTreeClassifier(random_state=42)
-        dt_classifier.fit(X_train, y_train)
+            # Train SVM (only predict() is used, so skip Platt-scaling calibration)
+            # Fit on the bare array: predict() is given arrays, and a model fitted
+            # with feature names re-checks (and warns about) them on every call
+            svm_classifier = SVC(random_state=42)
+            svm_classifier.fit(X_train.to_numpy(dtype=np.float64), y_train)
 
-        # Train SVM
-        svm_classifier = SVC(probability=True, random_state=42)
-        svm_classifier.fit(X_train, y_train)
+            # Calculate metrics
+            dt_accuracy = accuracy_score(y_test, dt_classifier.predict(X_test))
+            svm_accuracy = accuracy_score(
+                y_test, svm_classifier.predict(X_test.to_numpy(dtype=np.float64))
+            )
+            cv_mean = cross_val_score(dt_classifier, X_test, y_test, cv=3).mean()
+
+            _save_model_cache(
+                cache_file,
+                {
+                    "decision_tree": dt_classifier,
+                    "svm": svm_classifier,
+                    "label_encoder": label_encoder,
+                    "metrics": (dt_accuracy, svm_accuracy, cv_mean),
+                },
+            )
 
-        # Calculate metrics
-        dt_accuracy = accuracy_score(y_test, dt_classifier.predict(X_test))
-        svm_accuracy = accuracy_score(y_test, svm_classifier.predict(X_test))
-        cv_scores = cross_val_score(dt_classifier, X_test, y_test, cv=3)
+        _classes_array = label_encoder.classes_
+        _diseases_tuple = tuple(_classes_array.tolist())
 
         # Store models
         ml_models = {
             "decision_tree": dt_classifier,
             "svm": svm_classifier,
             "training_data": training_data,
-            "reduced_data": training_data.groupby(training_data["prognosis"]).max(),
+            # Symptom columns are 0/1, so int8 keeps the table 8x smaller
+            "reduced_data": training_data[feature_names]
+            .astype(np.int8)
+            .groupby(training_data["prognosis"])
+            .max(),
             "label_encoder": label_encoder,
         }
 
+        # Precompute the primary diagnosis for every single-symptom input. A
+        # symptom is present in every column sharing its normalized name.
+        flat_tree = _flatten_tree(dt_classifier.tree_)
+        columns_by_symptom: Dict[str, Set[int]] = {}
+        for index, symptom in enumerate(normalized_feature_names):
+            columns_by_symptom.setdefault(symptom, set()).add(index)
+        _primary_by_symptom = {
+            symptom: _classes_array[_walk_tree(flat_tree, columns)]
+            for symptom, columns in columns_by_symptom.items()
+        }
+        _primary_default = _classes_array[_walk_tree(flat_tree, set())]
+
         # Load supporting data
         load_severity_dict(master_data_path)
         load_description_dict(master_data_path)
         load_precaution_dict(master_data_path)
 
+        # Sort and serialize the list endpoints once per load
+        _sorted_symptoms = tuple(sorted(feature_names))
+        _sorted_diseases = tuple(sorted(_diseases_tuple))
+        _sorted_symptoms_json = _build_list_json("symptoms", _sorted_symptoms)
+        _sorted_diseases_json = _build_list_json("diseases", _sorted_diseases)
+
         # Update model status
         model_status.loaded = True
         model_status.last_loaded = datetime.now().isoformat()
         model_status.metrics = ModelMetrics(
             decision_tree_accuracy=dt_accuracy,
             svm_accuracy=svm_accuracy,
-            cross_validation_mean=cv_scores.mean(),
+            cross_validation_mean=cv_mean,
             total_symptoms=len(feature_names),
             total_diseases=len(label_encoder.classes_),
         )
@@ -128,11 +271,56 @@ def load_models_and_data(
         raise e
 
 
+def _model_cache_file(training_file: Path) -> Optional[Path]:
+    """Get the model cache file for the training data, or None if disabled"""
+    if not MODEL_CACHE_PATH:
+        return None
+
+    digest = hashlib.blake2b(
+        f"{MODEL_CACHE_VERSION}:{sklearn.__version__}:".encode(), digest_size=16
+    )
+    with open(training_file, "rb") as file:
+        while chunk := file.read(1 << 20):
+            digest.update(chunk)
+    return Path(MODEL_CACHE_PATH) / f"{digest.hexdigest()}.joblib"
+
+
+def _load_model_cache(cache_file: Optional[Path]) -> Optional[Dict]:
+    """Load cached models, or None if there are none (or they can't be read)"""
+    if cache_file is None or not cache_file.exists():
+        return None
+
+    try:
+        cached_models = joblib.load(cache_file)
+        logger.info(f"Loaded cached models from {cache_file}")
+        return cached_models
+    except Exception as e:
+        logger.warning(f"Could not load cached models from {cache_file}: {e}")
+        return None
+
+
+def _save_model_cache(cache_file: Optional[Path], models: Dict) -> None:
+    """Write trained models to the cache; failures only cost the next startup"""
+    if cache_file is None:
+        return
+
+    # Write to a temporary file first so readers never see a partial cache
+    temp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        joblib.dump(models, temp_file)
+        os.replace(temp_file, cache_file)
+        logger.info(f"Cached trained models at {cache_file}")
+    except Exception as e:
+        logger.warning(f"Could not cache trained models at {cache_file}: {e}")
+        temp_file.unlink(missing_ok=True)
+
+
 def load_severity_dict(master_data_path: Path) -> None:
     """Load symptom severity data"""
-    global data_dictionaries
+    global data_dictionaries, normalized_severity_dict
 
-    severity_file = master_data_path / "symptom_severity.csv"
+    severity_file = master_data_path / SEVERITY_FILE
     if severity_file.exists():
         try:
             with open(severity_file, "r", encoding="utf-8") as file:
@@ -143,6 +331,10 @@ def load_severity_dict(master_data_path: Path) -> None:
                             data_dictionaries["severity"][row[0]] = int(row[1])
                         except ValueError:
                             continue
+
+            normalized_severity_dict = {}
+            for symptom, severity in data_dictionaries["severity"].items():
+                normalized_severity_dict.setdefault(symptom.lower(), severity)
             logger.info(f"Loaded {len(data_dictionaries['severity'])} severity entries")
         except Exception as e:
             logger.error(f"Error loading severity data: {e}")
@@ -152,7 +344,7 @@ def load_description_dict(master_data_path: Path) -> None:
     """Load symptom descriptions"""
     global data_dictionaries
 
-    desc_file = master_data_path / "symptom_Description.csv"
+    desc_file = master_data_path / DESCRIPTION_FILE
     if desc_file.exists():
         try:
             with open(desc_file, "r", encoding="utf-8") as file:
@@ -171,7 +363,7 @@ def load_precaution_dict(master_data_path: Path) -> None:
     """Load precaution data"""
     global data_dictionaries
 
-    precaution_file = master_data_path / "symptom_precaution.csv"
+    precaution_file = master_data_path / PRECAUTION_FILE
     if precaution_file.exists():
         try:
             with open(precaution_file, "r", encoding="utf-8") as file:
@@ -197,105 +389,164 @@ def search_symptoms(
     # Normalize input
     search_term = symptom_query.replace(" ", "_").lower()
 
-    # Create regex pattern for flexible matching
-    pattern = re.compile(search_term, re.IGNORECASE)
+    # Cached matches are a shared tuple, so hand callers their own list
+    matches, exact_match = _search_normalized_symptoms(search_term, max_matches)
+    return list(matches), exact_match
+
+
+@lru_cache(maxsize=4096)
+def _search_normalized_symptoms(
+    search_term: str, max_matches: int
+) -> Tuple[Tuple[str, ...], bool]:
+    """Search for symptoms matching a normalized term, cached until the next load"""
+    # Put the exact match first
+    exact_index = normalized_symptoms_dict.get(search_term)
+    exact_match = exact_index is not None
+    matches = [feature_names[exact_index]] if exact_match else []
+    seen = set(matches)
+
+    # Then every symptom containing the search term, in feature order
+    for index in _find_symptoms_containing(search_term):
+        if len(matches) >= max_matches:
+            break
+        symptom = feature_names[index]
+        if symptom not in seen:
+            seen.add(symptom)
+            matches.append(symptom)
 
-    # Search through available symptoms
-    matches = []
-    exact_match = False
+    return tuple(matches[:max_matches]), exact_match
 
-    for symptom in feature_names:
-        if symptom.lower() == search_term:
-            exact_match = True
-            matches.insert(0, symptom)  # Put exact match first
-        elif pattern.search(symptom.lower()):
-            matches.append(symptom)
 
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_matches = []
-    for match in matches:
-        if match not in seen:
-            seen.add(match)
-            unique_matches.append(match)
+def match_symptom(normalized_symptom: str) -> Optional[str]:
+    """Find the symptom equal to a normalized name, else the first containing it"""
+    if not model_status.loaded:
+        return None
+
+    index = normalized_symptoms_dict.get(normalized_symptom)
+    if index is None:
+        index = next(_find_symptoms_containing(normalized_symptom), None)
+
+    return feature_names[index] if index is not None else None
+
 
-    return unique_matches[:max_matches], exact_match
+def _find_symptoms_containing(term: str) -> Iterator[int]:
+    """Yield the index of each symptom containing a normalized term, in order"""
+    # The separator never occurs in a symptom, so a term containing it can't match
+    if "\n" in term:
+        return
+
+    # Bind the index to locals; a reload swaps the globals, not these objects
+    find, offsets = _symptom_index_text.find, _symptom_index_offsets
+
+    position = find(term)
+    while position != -1:
+        index = bisect_right(offsets, position) - 1
+        yield index
+
+        # Resume at the next symptom so each one is reported once
+        position = find(term, offsets[index + 1])
+
+
+def _build_symptom_index(names: Tuple[str, ...]) -> Tuple[str, Tuple[int, ...]]:
+    """Join names for substring search, returning the text and start offsets"""
+    offsets = [0]
+    for name in names:
+        offsets.append(offsets[-1] + len(name) + 1)
+    return "\n".join(names), tuple(offsets)
 
 
 def get_primary_diagnosis(symptom: str) -> str:
-    """Get primary diagnosis using decision tree traversal"""
+    """Get primary diagnosis from the precomputed decision tree traversals"""
     if not model_status.loaded:
         raise RuntimeError("Models not loaded")
 
-    try:
-        tree = ml_models["decision_tree"].tree_
-        feature_names_array = np.array(feature_names)
-
-        def recurse(node):
-            if tree.feature[node] != _tree.TREE_UNDEFINED:
-                feature_name = feature_names_array[tree.feature[node]]
-
-                if feature_name.lower() == symptom.lower():
-                    # Follow the positive branch
-                    return recurse(tree.children_right[node])
-                else:
-                    # Follow the negative branch
-                    return recurse(tree.children_left[node])
-            else:
-                # Leaf node - get diagnosis
-                class_probabilities = tree.value[node][0]
-                predicted_class = np.argmax(class_probabilities)
-                return label_encoder.inverse_transform([predicted_class])[0]
-
-        return recurse(0)
+    return _primary_by_symptom.get(symptom.lower(), _primary_default)
 
-    except Exception as e:
-        logger.error(f"Error in primary diagnosis: {str(e)}")
-        return "Unknown"
+
+def _flatten_tree(tree) -> Tuple[List[int], List[int], List[int], List[int]]:
+    """Copy a fitted tree into plain lists of (feature, left, right, leaf class)"""
+    return (
+        tree.feature.tolist(),
+        tree.children_left.tolist(),
+        tree.children_right.tolist(),
+        np.argmax(tree.value[:, 0, :], axis=1).tolist(),
+    )
 
 
-def get_secondary_diagnosis(symptoms: List[str]) -> str:
+def _walk_tree(
+    flat_tree: Tuple[List[int], List[int], List[int], List[int]],
+    columns: Set[int],
+) -> int:
+    """Get the leaf class for present symptom columns, following their splits right"""
+    feature, left, right, leaf_class = flat_tree
+
+    node = 0
+    while feature[node] != _tree.TREE_UNDEFINED:
+        node = right[node] if feature[node] in columns else left[node]
+
+    return leaf_class[node]
+
+
+def get_secondary_diagnosis(
+    symptoms: List[str], assume_normalized: bool = False
+) -> str:
     """Get secondary diagnosis using SVM with symptom vector"""
+    return get_secondary_diagnoses([symptoms], assume_normalized)[0]
+
+
+def get_secondary_diagnoses(
+    symptom_lists: List[List[str]], assume_normalized: bool = False
+) -> List[str]:
+    """Get secondary diagnoses for several symptom lists with a single SVM call"""
     if not model_status.loaded:
         raise RuntimeError("Models not loaded")
 
     try:
-        # Create input vector
-        input_vector = np.zeros(len(feature_names))
-
-        for symptom in symptoms:
-            # Normalize symptom name
-            normalized_symptom = symptom.replace(" ", "_").lower()
-
-            # Find matching feature
-            for i, feature in enumerate(feature_names):
-                if feature.lower() == normalized_symptom:
-                    input_vector[i] = 1
-                    break
-
-        # Get prediction
-        prediction = ml_models["svm"].predict([input_vector])
-        return label_encoder.inverse_transform(prediction)[0]
+        # Collect the (row, column) of every known symptom, with the lookups
+        # bound to locals for the inner loop
+        rows, columns = [], []
+        add_row, add_column = rows.append, columns.append
+        feature_index = normalized_symptoms_dict.get
+        for row, symptoms in enumerate(symptom_lists):
+            for symptom in symptoms:
+                # Normalize symptom name and look up its feature column
+                if not assume_normalized:
+                    symptom = symptom.replace(" ", "_").lower()
+                index = feature_index(symptom)
+                if index is not None:
+                    add_row(row)
+                    add_column(index)
+
+        # Create one input row per symptom list (float64, as libsvm expects)
+        input_matrix = np.zeros((len(symptom_lists), len(feature_names)))
+        input_matrix[rows, columns] = 1
+
+        # Get predictions
+        predictions = ml_models["svm"].predict(input_matrix)
+        return _classes_array[predictions].tolist()
 
     except Exception as e:
         logger.error(f"Error in secondary diagnosis: {str(e)}")
-        return "Unknown"
+        return ["Unknown"] * len(symptom_lists)
 
 
-def calculate_severity(symptoms: List[str], days: int) -> str:
+def calculate_severity(
+    symptoms: List[str], days: int, assume_normalized: bool = False
+) -> str:
     """Calculate severity assessment based on symptoms and duration"""
     try:
         total_severity = 0
         symptom_count = 0
+        severity_of = normalized_severity_dict.get
 
         for symptom in symptoms:
-            normalized_symptom = symptom.replace(" ", "_").lower()
+            if not assume_normalized:
+                symptom = symptom.replace(" ", "_").lower()
             # Try to find severity score
-            for severity_key in data_dictionaries["severity"]:
-                if severity_key.lower() == normalized_symptom:
-                    total_severity += data_dictionaries["severity"][severity_key]
-                    symptom_count += 1
-                    break
+            severity = severity_of(symptom)
+            if severity is not None:
+                total_severity += severity
+                symptom_count += 1
 
         if symptom_count == 0:
             return "Unable to assess severity - no matching symptoms found"
@@ -325,11 +576,13 @@ def get_disease_description(disease: str) -> str:
 
 def get_disease_precautions(disease: str) -> List[str]:
     """Get precautions for a disease"""
-    precautions = data_dictionaries["precautions"].get(
-        disease, ["Consult a healthcare professional"]
+    # Entries are stripped and filtered when loaded; copy so callers can't
+    # mutate the shared list
+    return list(
+        data_dictionaries["precautions"].get(
+            disease, ["Consult a healthcare professional"]
+        )
     )
-    # Filter out empty strings and strip whitespace
-    return [p.strip() for p in precautions if p.strip()]
 
 
 def get_model_status() -> ModelStatus:
@@ -342,25 +595,39 @@ def is_models_loaded() -> bool:
     return model_status.loaded
 
 
-def get_available_symptoms() -> List[str]:
-    """Get list of all available symptoms"""
-    return feature_names.copy() if model_status.loaded else []
+def get_available_symptoms() -> Sequence[str]:
+    """Get all available symptoms"""
+    return _feature_names_tuple if model_status.loaded else ()
 
 
-def get_available_diseases() -> List[str]:
-    """Get list of all available diseases"""
-    if not model_status.loaded:
-        return []
-    return label_encoder.classes_.tolist()
+def get_normalized_symptom_index() -> Mapping[str, int]:
+    """Get the lowercased symptom name -> feature index lookup"""
+    return normalized_symptoms_dict if model_status.loaded else {}
+
+
+def get_available_diseases() -> Sequence[str]:
+    """Get all available diseases"""
+    return _diseases_tuple if model_status.loaded else ()
+
+
+def get_sorted_symptoms_json() -> bytes:
+    """Get the serialized sorted symptom list payload"""
+    return _sorted_symptoms_json
+
+
+def get_sorted_diseases_json() -> bytes:
+    """Get the serialized sorted disease list payload"""
+    return _sorted_diseases_json
 
 
-def validate_symptom(symptom: str) -> bool:
+def validate_symptom(symptom: str, assume_normalized: bool = False) -> bool:
     """Validate if a symptom exists in the database"""
     if not model_status.loaded:
         return False
 
-    normalized = symptom.replace(" ", "_").lower()
-    return any(feature.lower() == normalized for feature in feature_names)
+    if not assume_normalized:
+        symptom = symptom.replace(" ", "_").lower()
+    return symptom in normalized_symptoms_dict
 
 
 def get_model_metrics() -> Optional[ModelMetrics]:
@@ -372,7 +639,7 @@ def reload_models() -> bool:
     """Reload models and data"""
     try:
         return load_models_and_data(
-            model_status.data_path, model_status.master_data_path
+            model_status.data_path, model_status.master_data_path, force_retrain=True
         )
     except Exception as e:
         logger.error(f"Error reloading models: {e}")